@@ -10,10 +10,13 @@ from .main_rhythm import (
     group_by_onset,
     get_soprano_bass,
     select_main_rhythm,
+    select_main_rhythm_many,
     detect_primary_voice,
 )
+from .rules import RuleSet, CompiledRules, compile_rules, load_rules
 from .midi_io import midi_to_note_events, note_events_to_midi
 from .csv_io import save_csv, load_csv
+from .batch_io import load_many
 from .validation import check_events_one_note_per_onset, check_csv_one_note_per_onset
 
 __all__ = [
@@ -21,11 +24,17 @@ __all__ = [
     "group_by_onset",
     "get_soprano_bass",
     "select_main_rhythm",
+    "select_main_rhythm_many",
     "detect_primary_voice",
+    "RuleSet",
+    "CompiledRules",
+    "compile_rules",
+    "load_rules",
     "midi_to_note_events",
     "note_events_to_midi",
     "save_csv",
     "load_csv",
+    "load_many",
     "check_events_one_note_per_onset",
     "check_csv_one_note_per_onset",
 ]
@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .csv_io import load_csv
+from .midi_io import midi_to_note_events
+from .note_event import NoteEvent
+
+PathLike = Union[str, Path]
+
+
+def load_many(
+    paths: Iterable[PathLike],
+) -> Tuple[List[NoteEvent], List[int], List[Optional[int]]]:
+    """
+    Load many MIDI (.mid/.midi) and CSV (.csv) files into one event buffer.
+
+    Returns:
+        (events, offsets, ticks_per_beat)
+        events         = all NoteEvents, file after file, in loader order.
+        offsets        = file i is events[offsets[i]:offsets[i + 1]].
+        ticks_per_beat = per file; None for CSV inputs.
+
+    The result plugs straight into select_main_rhythm_many(events, offsets).
+    """
+    events: List[NoteEvent] = []
+    offsets: List[int] = [0]
+    ticks_per_beat: List[Optional[int]] = []
+
+    for path in paths:
+        suffix = Path(path).suffix.lower()
+        if suffix in (".mid", ".midi"):
+            piece, tpb = midi_to_note_events(path)
+        elif suffix == ".csv":
+            piece, tpb = load_csv(path), None
+        else:
+            raise ValueError(f"Unsupported input file type: {path} (use .mid/.midi or .csv)")
+
+        events.extend(piece)
+        offsets.append(len(events))
+        ticks_per_beat.append(tpb)
+
+    return events, offsets, ticks_per_beat
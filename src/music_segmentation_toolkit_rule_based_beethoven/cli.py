@@ -4,6 +4,7 @@ from pathlib import Path
 from .csv_io import save_csv
 from .main_rhythm import select_main_rhythm
 from .midi_io import midi_to_note_events, note_events_to_midi
+from .rules import compile_rules, load_rules
 from .validation import check_events_one_note_per_onset
 
 
@@ -29,6 +30,12 @@ def main() -> None:
         help="Beats per bar (time signature top number) for metric weighting (default: 4).",
     )
 
+    parser.add_argument(
+        "--rules",
+        default=None,
+        help="Optional .json/.toml rule file overriding the built-in scoring weights.",
+    )
+
     args = parser.parse_args()
 
     midi_in = Path(args.midi_in)
@@ -37,7 +44,8 @@ def main() -> None:
     events, tpb = midi_to_note_events(midi_in)
 
     # 2. Extract main rhythm
-    main_line = select_main_rhythm(events, beats_per_bar=args.beats_per_bar)
+    rules = compile_rules(load_rules(args.rules)) if args.rules is not None else None
+    main_line = select_main_rhythm(events, beats_per_bar=args.beats_per_bar, rules=rules)
 
     # 3. Validate one note per onset (should always be True)
     ok, counts = check_events_one_note_per_onset(main_line)
@@ -1,8 +1,19 @@
 import math
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 from .note_event import NoteEvent
+from .rules import (
+    DEFAULT_RULES,
+    MAX_INTERVAL,
+    RANK_BASS,
+    RANK_INNER,
+    RANK_TOP,
+    CompiledRules,
+    RuleSet,
+    compile_rules,
+)
 
 
 def group_by_onset(events: List[NoteEvent]) -> Dict[float, List[NoteEvent]]:
@@ -45,18 +56,16 @@ def detect_primary_voice(groups: Dict[float, List[NoteEvent]]) -> str:
     if not groups:
         return "top"
 
-    onsets = sorted(groups.keys())
-    top_line: List[int] = []
-    bass_line: List[int] = []
+    return _primary_voice([get_soprano_bass(groups[onset]) for onset in sorted(groups)])
 
-    for onset in onsets:
-        notes = groups[onset]
-        top, bass = get_soprano_bass(notes)
-        top_line.append(top.pitch)
-        bass_line.append(bass.pitch)
 
-    top_s = smoothness(top_line)
-    bass_s = smoothness(bass_line)
+def _primary_voice(outer: Sequence[Tuple[NoteEvent, NoteEvent]]) -> str:
+    """
+    Pick "top" or "bass" from the (top, bass) notes of each slice of one
+    piece, in onset order.
+    """
+    top_s = smoothness([top.pitch for top, _ in outer])
+    bass_s = smoothness([bass.pitch for _, bass in outer])
 
     # Choose the smoother line (with some hysteresis).
     if top_s <= bass_s * 0.8:
@@ -93,127 +102,210 @@ def metric_strength(onset: float, beats_per_bar: int = 4) -> int:
         return 0
 
 
+def _group_context(
+    group: List[NoteEvent],
+    onset: float,
+    primary_voice: str,
+    beats_per_bar: int,
+    rules: CompiledRules,
+) -> Tuple[Tuple[float, ...], float, float]:
+    """
+    Lookups shared by every note of a group: the pitch-rank table for the
+    primary voice, the metric weight of `onset`, and the duration below
+    which an inner note counts as an ornament.
+    """
+    rank = rules.rank.get(primary_voice, rules.rank[None])
+    metric = rules.metric[metric_strength(onset, beats_per_bar=beats_per_bar)]
+    max_dur = max((n.duration for n in group), default=0.0)
+    short = max_dur * rules.ornament_ratio if max_dur > 0 else float("-inf")
+    return rank, metric, short
+
+
+def _note_static_score(
+    note: NoteEvent,
+    top: NoteEvent,
+    bass: NoteEvent,
+    rank: Tuple[float, ...],
+    metric: float,
+    short: float,
+    rules: CompiledRules,
+) -> float:
+    """
+    Score one note on the features that do not depend on the previously
+    chosen note: pitch rank, grace, staff, voice, duration class and metric
+    level. Each feature is a single table lookup.
+    """
+    code = (note is top) * RANK_TOP | (note is bass) * RANK_BASS
+    # Very short inner note relative to others -> likely ornament.
+    ornament = code == RANK_INNER and note.duration < short
+    return (
+        rank[code]
+        + rules.grace[note.is_grace]
+        + rules.staff.get(note.staff, 0.0)
+        + rules.voice.get(note.voice, 0.0)
+        + rules.duration[rules.duration_class(note.duration, ornament)]
+        + metric
+    )
+
+
+def _interval_weight(pitch: int, prev_pitch: int, rules: CompiledRules) -> float:
+    # Everything past the last interval bound scores as a leap.
+    return rules.interval[min(abs(pitch - prev_pitch), MAX_INTERVAL)]
+
+
+def _resolve_rules(rules: Union[RuleSet, CompiledRules, None]) -> CompiledRules:
+    if rules is None:
+        return DEFAULT_RULES
+    if isinstance(rules, RuleSet):
+        return compile_rules(rules)
+    return rules
+
+
 def score_note(
     note: NoteEvent,
     group: List[NoteEvent],
     primary_voice: str,
     prev_main: Optional[NoteEvent],
     beats_per_bar: int = 4,
-    ornament_ratio: float = 0.25,
+    ornament_ratio: Optional[float] = None,
+    rules: Union[RuleSet, CompiledRules, None] = None,
 ) -> float:
     """
     Assign a score to a note in its group based on fully rule-based heuristics.
 
+    `ornament_ratio`, when given, overrides the value from `rules`.
+
     Higher score = more likely to be the 'main rhythm' note.
     """
-    top, bass = get_soprano_bass(group)
-    score = 0.0
-
-    # 0. Grace notes are decorative.
-    if note.is_grace:
-        score -= 3.0
-
-    # 1. Primary voice orientation (global).
-    if primary_voice == "top" and note is top:
-        score += 10.0
-    if primary_voice == "bass" and note is bass:
-        score += 10.0
+    rules = _resolve_rules(rules)
+    if ornament_ratio is not None:
+        rules = replace(rules, ornament_ratio=ornament_ratio)
 
-    # 2. Outer voice preference.
-    if note is top:
-        score += 4.0
-    if note is bass:
-        score += 2.0
-
-    # 3. Staff: prefer right-hand for melody in classical piano.
-    if note.staff == "RH":
-        score += 2.0
+    top, bass = get_soprano_bass(group)
+    # The note need not share the group's onset: weight its own position.
+    rank, metric, short = _group_context(group, note.onset, primary_voice, beats_per_bar, rules)
+    score = _note_static_score(note, top, bass, rank, metric, short, rules)
 
-    # 4. Voice number (if known).
-    if note.voice == 1:
-        score += 2.0
+    # Melodic continuity with previous main note.
+    if prev_main is not None:
+        score += _interval_weight(note.pitch, prev_main.pitch, rules)
 
-    # 5. Duration + ornament filtering.
-    max_dur = max((n.duration for n in group), default=0.0)
-    if max_dur > 0 and note.duration < max_dur * ornament_ratio and not (
-        note is top or note is bass
-    ):
-        # Very short inner note relative to others -> likely ornament.
-        score -= 2.0
-    else:
-        # Longer notes are structurally more important.
-        if note.duration >= 2.0:
-            score += 4.0
-        elif note.duration >= 1.0:
-            score += 2.0
+    return score
 
-    # 6. Metric strength.
-    score += metric_strength(note.onset, beats_per_bar=beats_per_bar)
 
-    # 7. Melodic continuity with previous main note.
+def _choose_note(
+    group: List[NoteEvent],
+    top: NoteEvent,
+    bass: NoteEvent,
+    rank: Tuple[float, ...],
+    metric: float,
+    short: float,
+    prev_main: Optional[NoteEvent],
+    rules: CompiledRules,
+) -> NoteEvent:
+    """
+    Pick the highest-scoring note of a group (first one wins ties).
+    """
+    scores = [_note_static_score(n, top, bass, rank, metric, short, rules) for n in group]
     if prev_main is not None:
-        interval = abs(note.pitch - prev_main.pitch)
-        if interval == 0:
-            score += 4.0
-        elif interval <= 2:
-            score += 3.0
-        elif interval <= 5:
-            score += 1.0
-        elif interval > 12:
-            score -= 2.0
+        prev_pitch = prev_main.pitch
+        scores = [
+            s + _interval_weight(n.pitch, prev_pitch, rules) for n, s in zip(group, scores)
+        ]
 
-    return score
+    return group[max(range(len(group)), key=scores.__getitem__)]
 
 
 def select_main_rhythm(
     events: List[NoteEvent],
     beats_per_bar: int = 4,
+    rules: Union[RuleSet, CompiledRules, None] = None,
 ) -> List[NoteEvent]:
     """
     Main public API: extract a single-note 'main rhythm' line.
 
+    `rules` may be a RuleSet (compiled here) or an already compiled
+    CompiledRules; defaults to the built-in Beethoven rules.
+
     Guarantees:
       * For each onset where there were notes, keeps EXACTLY one note.
       * Never deletes all notes at a given time point.
     """
-    if not events:
-        return []
+    main_line, _ = select_main_rhythm_many(events, [0, len(events)], beats_per_bar, rules)
+    return main_line
 
-    groups = group_by_onset(events)
-    onsets = sorted(groups.keys())
-    primary_voice = detect_primary_voice(groups)
 
-    result: List[NoteEvent] = []
-    prev_main: Optional[NoteEvent] = None
+def select_main_rhythm_many(
+    events: List[NoteEvent],
+    offsets: Sequence[int],
+    beats_per_bar: int = 4,
+    rules: Union[RuleSet, CompiledRules, None] = None,
+) -> Tuple[List[NoteEvent], List[int]]:
+    """
+    Batched select_main_rhythm() over many pieces held in one event buffer.
 
-    for onset in onsets:
-        group = groups[onset]
+    Piece i is events[offsets[i]:offsets[i + 1]]; offsets starts at 0 and
+    ends at len(events) (as returned by load_many()). All pieces are
+    grouped in one pass with one sort; selection is then the same plain
+    Python loop over slices that select_main_rhythm() uses. Throughput is
+    about the same as calling select_main_rhythm() per piece: this is a
+    convenience for data already held in one buffer, not a speedup.
 
+    Returns:
+        (main_line, line_offsets)
+        main_line    = all main rhythm notes, piece after piece, in one list.
+        line_offsets = piece i is main_line[line_offsets[i]:line_offsets[i + 1]].
+
+    main_line is a plain list, so slicing out a piece copies it rather
+    than returning a view.
+    """
+    if not offsets or offsets[0] != 0 or offsets[-1] != len(events):
+        raise ValueError("offsets must start at 0 and end at len(events).")
+    if any(offsets[i] > offsets[i + 1] for i in range(len(offsets) - 1)):
+        raise ValueError("offsets must be non-decreasing.")
+
+    rules = _resolve_rules(rules)
+    n_pieces = len(offsets) - 1
+
+    # 1. Group all pieces at once; one sort orders by piece, then onset.
+    groups: Dict[Tuple[int, float], List[NoteEvent]] = defaultdict(list)
+    for piece in range(n_pieces):
+        for ev in events[offsets[piece]:offsets[piece + 1]]:
+            groups[(piece, ev.onset)].append(ev)
+    keys = sorted(groups.keys())
+
+    # 2. Outer voices of every slice, then the primary voice of each piece.
+    outer = [get_soprano_bass(groups[key]) for key in keys]
+    outer_by_piece: List[List[Tuple[NoteEvent, NoteEvent]]] = [[] for _ in range(n_pieces)]
+    for (piece, _), pair in zip(keys, outer):
+        outer_by_piece[piece].append(pair)
+    primary_voices = [_primary_voice(pairs) for pairs in outer_by_piece]
+
+    # 3. Choose one note per slice; continuity restarts at each piece.
+    result: List[NoteEvent] = []
+    line_offsets = [0] * (n_pieces + 1)
+    prev_main: Optional[NoteEvent] = None
+    prev_piece = -1
+    for key, (top, bass) in zip(keys, outer):
+        piece, onset = key
+        if piece != prev_piece:
+            prev_main = None
+            prev_piece = piece
+
+        group = groups[key]
         if len(group) == 1:
             chosen = group[0]
         else:
-            best_note: Optional[NoteEvent] = None
-            best_score = float("-inf")
-
-            for note in group:
-                s = score_note(
-                    note=note,
-                    group=group,
-                    primary_voice=primary_voice,
-                    prev_main=prev_main,
-                    beats_per_bar=beats_per_bar,
-                )
-                if s > best_score:
-                    best_score = s
-                    best_note = note
-
-            if best_note is None:
-                # Failsafe: choose soprano.
-                best_note, _ = get_soprano_bass(group)
-
-            chosen = best_note
+            rank, metric, short = _group_context(
+                group, onset, primary_voices[piece], beats_per_bar, rules
+            )
+            chosen = _choose_note(group, top, bass, rank, metric, short, prev_main, rules)
 
         result.append(chosen)
+        line_offsets[piece + 1] += 1
         prev_main = chosen
 
-    return result
+    for piece in range(n_pieces):
+        line_offsets[piece + 1] += line_offsets[piece]
+
+    return result, line_offsets
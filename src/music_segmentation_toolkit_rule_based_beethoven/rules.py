@@ -0,0 +1,213 @@
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+# Pitch-rank codes inside a time slice: bit 0 = soprano, bit 1 = bass.
+# A lone note (or a unison) is both at once.
+RANK_INNER = 0
+RANK_TOP = 1
+RANK_BASS = 2
+RANK_TOP_BASS = RANK_TOP | RANK_BASS
+
+# Largest melodic interval between two MIDI pitches (0-127).
+MAX_INTERVAL = 127
+
+
+@dataclass
+class RuleSet:
+    """
+    Declarative description of the note-scoring heuristics.
+
+    Every field is a weight (or a threshold/weight table) attached to one
+    precomputed note feature. The defaults reproduce the built-in
+    Beethoven rules.
+    """
+    grace: float = -3.0            # note is a grace note
+    primary_voice: float = 10.0    # note is the globally leading outer voice
+    top: float = 4.0               # note is the soprano of its slice
+    bass: float = 2.0              # note is the bass of its slice
+    staff: Dict[str, float] = field(default_factory=lambda: {"RH": 2.0})
+    voice: Dict[int, float] = field(default_factory=lambda: {1: 2.0})
+    ornament_ratio: float = 0.25   # inner note shorter than this * longest = ornament
+    ornament: float = -2.0
+    # (min_duration, weight): the longest threshold reached applies.
+    duration: List[Tuple[float, float]] = field(
+        default_factory=lambda: [(2.0, 4.0), (1.0, 2.0)]
+    )
+    # Indexed by metric level: 0 = weak, 1 = medium, 2 = strong.
+    metric: Tuple[float, float, float] = (0.0, 1.0, 2.0)
+    # (max_interval, weight) in semitones to the previous main note:
+    # the smallest bound that contains the interval applies.
+    interval: List[Tuple[int, float]] = field(
+        default_factory=lambda: [(0, 4.0), (2, 3.0), (5, 1.0), (12, 0.0)]
+    )
+    leap: float = -2.0             # interval beyond the last bound
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RuleSet":
+        """
+        Build a RuleSet from a plain mapping (e.g. parsed JSON/TOML).
+
+        Missing keys keep their default value; unknown keys or malformed
+        values raise ValueError.
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown rule keys: {sorted(unknown)}")
+
+        kwargs: Dict[str, Any] = {}
+        for key, value in data.items():
+            try:
+                kwargs[key] = _convert_rule(key, value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid value for rule {key!r}: {value!r} ({exc})") from exc
+        return cls(**kwargs)
+
+
+def _convert_rule(key: str, value: Any) -> Any:
+    """
+    Convert one parsed rule value to the type RuleSet expects.
+    """
+    if key in ("staff", "voice"):
+        if not isinstance(value, Mapping):
+            raise TypeError("expected a table of label -> weight")
+        if key == "staff":
+            return {str(k): float(v) for k, v in value.items()}
+        return {_as_int(k): float(v) for k, v in value.items()}
+    if key == "duration":
+        return [(float(lo), float(w)) for lo, w in value]
+    if key == "interval":
+        return [(_as_int(hi), float(w)) for hi, w in value]
+    if key == "metric":
+        return tuple(float(w) for w in value)
+    return float(value)
+
+
+def _as_int(value: Any) -> int:
+    """
+    int() that refuses to truncate: 2 and "2" pass, 2.5 and True do not.
+    """
+    if isinstance(value, bool):
+        raise TypeError(f"expected an integer, got {value!r}")
+    number = int(value) if isinstance(value, str) else value
+    if not isinstance(number, (int, float)) or number != int(number):
+        raise ValueError(f"expected an integer, got {value!r}")
+    return int(number)
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """
+    Lookup-table form of a RuleSet, built once by compile_rules().
+
+    A note's score is a sum of table lookups indexed by its features:
+    no rule is evaluated as a Python branch at selection time. All tables
+    are read-only, so a shared instance (e.g. DEFAULT_RULES) cannot be
+    changed by one caller under another.
+    """
+    rank: Mapping[Optional[str], Tuple[float, ...]]  # primary voice -> [rank code]
+    grace: Tuple[float, float]                       # [is_grace]
+    staff: Mapping[Optional[str], float]
+    voice: Mapping[Optional[int], float]
+    ornament_ratio: float
+    duration_bounds: Tuple[float, ...]              # ascending thresholds
+    duration: Tuple[float, ...]                     # [0] = ornament, [1 + class]
+    metric: Tuple[float, float, float]              # [metric level]
+    interval: Tuple[float, ...]                     # [abs interval], 0..MAX_INTERVAL
+
+    def duration_class(self, duration: float, ornament: bool) -> int:
+        """
+        Map a note duration to its index in the duration table.
+        """
+        if ornament:
+            return 0
+        return 1 + bisect_right(self.duration_bounds, duration)
+
+
+def compile_rules(rules: RuleSet) -> CompiledRules:
+    """
+    Compile a RuleSet into lookup tables and weight vectors.
+    """
+    if len(rules.metric) != 3:
+        raise ValueError("metric must have 3 weights (weak, medium, strong).")
+
+    rank_weights = []
+    for primary in ("top", "bass", None):
+        table = []
+        for code in range(RANK_TOP_BASS + 1):
+            w = 0.0
+            if code & RANK_TOP:
+                w += rules.top
+                if primary == "top":
+                    w += rules.primary_voice
+            if code & RANK_BASS:
+                w += rules.bass
+                if primary == "bass":
+                    w += rules.primary_voice
+            table.append(w)
+        rank_weights.append(tuple(table))
+
+    steps = sorted(rules.duration)
+    duration = (rules.ornament, 0.0) + tuple(w for _, w in steps)
+
+    bounds = sorted(rules.interval)
+    interval = []
+    for i in range(MAX_INTERVAL + 1):
+        w = rules.leap
+        for hi, weight in bounds:
+            if i <= hi:
+                w = weight
+                break
+        interval.append(w)
+
+    return CompiledRules(
+        rank=MappingProxyType(dict(zip(("top", "bass", None), rank_weights))),
+        grace=(0.0, rules.grace),
+        staff=MappingProxyType(dict(rules.staff)),
+        voice=MappingProxyType(dict(rules.voice)),
+        ornament_ratio=rules.ornament_ratio,
+        duration_bounds=tuple(lo for lo, _ in steps),
+        duration=duration,
+        metric=tuple(rules.metric),
+        interval=tuple(interval),
+    )
+
+
+def load_rules(path: PathLike) -> RuleSet:
+    """
+    Load a RuleSet from a .json or .toml file.
+
+    TOML needs Python 3.11+ (tomllib) or the 'toml' extra (tomli).
+    """
+    rules_path = Path(path)
+    suffix = rules_path.suffix.lower()
+
+    if suffix == ".json":
+        with rules_path.open(encoding="utf-8") as f:
+            data = json.load(f)
+    elif suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError as exc:
+                raise ImportError(
+                    "Reading TOML rule files requires Python 3.11+ or the 'toml' extra: "
+                    "pip install 'music-segmentation-toolkit-rule-based-beethoven[toml]'"
+                ) from exc
+        with rules_path.open("rb") as f:
+            data = tomllib.load(f)
+    else:
+        raise ValueError(f"Unsupported rule file type: {rules_path.suffix!r} (use .json or .toml)")
+
+    return RuleSet.from_dict(data)
+
+
+DEFAULT_RULES = compile_rules(RuleSet())
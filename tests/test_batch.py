@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from music_segmentation_toolkit_rule_based_beethoven import (
+    load_csv,
+    load_many,
+    midi_to_note_events,
+    save_csv,
+    select_main_rhythm_many,
+)
+
+from test_main_rhythm import PATHETIQUE, assert_same_notes, random_piece, reference_select
+
+
+def concat(pieces):
+    events = [ev for piece in pieces for ev in piece]
+    offsets = [0]
+    for piece in pieces:
+        offsets.append(offsets[-1] + len(piece))
+    return events, offsets
+
+
+@pytest.mark.parametrize("beats_per_bar", [2, 3, 4])
+def test_many_matches_reference_per_piece(beats_per_bar):
+    rng = random.Random(beats_per_bar)
+    pieces = [random_piece(rng, max_notes=30) for _ in range(300)]
+    events, offsets = concat(pieces)
+
+    main_line, line_offsets = select_main_rhythm_many(events, offsets, beats_per_bar)
+
+    assert len(line_offsets) == len(pieces) + 1
+    assert line_offsets[0] == 0 and line_offsets[-1] == len(main_line)
+    for i, piece in enumerate(pieces):
+        assert_same_notes(
+            main_line[line_offsets[i]:line_offsets[i + 1]],
+            reference_select(piece, beats_per_bar=beats_per_bar),
+        )
+
+
+def test_many_with_empty_pieces():
+    assert select_main_rhythm_many([], [0]) == ([], [0])
+    piece = random_piece(random.Random(7), max_notes=30)
+    assert piece
+    events, offsets = concat([[], piece, []])
+    main_line, line_offsets = select_main_rhythm_many(events, offsets)
+    assert line_offsets == [0, 0, len(main_line), len(main_line)]
+
+
+@pytest.mark.parametrize("offsets", [[], [1, 3], [0, 2], [0, 3, 2, 3]])
+def test_many_rejects_bad_offsets(offsets):
+    events = random_piece(random.Random(11))[:3]
+    assert len(events) == 3
+    with pytest.raises(ValueError):
+        select_main_rhythm_many(events, offsets)
+
+
+def test_load_many_midi_and_csv(tmp_path):
+    midi_events, tpb = midi_to_note_events(PATHETIQUE)
+    csv_path = tmp_path / "excerpt.csv"
+    save_csv(midi_events[:50], csv_path)
+
+    events, offsets, ticks_per_beat = load_many([PATHETIQUE, csv_path])
+
+    assert offsets == [0, len(midi_events), len(midi_events) + 50]
+    assert ticks_per_beat == [tpb, None]
+    assert events[offsets[1]:] == load_csv(csv_path)
+
+
+def test_load_many_rejects_unknown_suffix(tmp_path):
+    with pytest.raises(ValueError):
+        load_many([tmp_path / "notes.txt"])
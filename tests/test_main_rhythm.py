@@ -0,0 +1,150 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from music_segmentation_toolkit_rule_based_beethoven import (
+    NoteEvent,
+    RuleSet,
+    detect_primary_voice,
+    get_soprano_bass,
+    group_by_onset,
+    midi_to_note_events,
+    select_main_rhythm,
+)
+from music_segmentation_toolkit_rule_based_beethoven.main_rhythm import (
+    metric_strength,
+    score_note,
+)
+
+PATHETIQUE = Path(__file__).resolve().parents[1] / "src" / "TEST" / "sonate-no-8-pathetique-3rd-movement.mid"
+
+
+def reference_score(note, group, primary_voice, prev_main, beats_per_bar=4, ornament_ratio=0.25):
+    """
+    The original hand-written rule chain that the default RuleSet encodes.
+    """
+    top, bass = get_soprano_bass(group)
+    score = 0.0
+    if note.is_grace:
+        score -= 3.0
+    if primary_voice == "top" and note is top:
+        score += 10.0
+    if primary_voice == "bass" and note is bass:
+        score += 10.0
+    if note is top:
+        score += 4.0
+    if note is bass:
+        score += 2.0
+    if note.staff == "RH":
+        score += 2.0
+    if note.voice == 1:
+        score += 2.0
+    max_dur = max((n.duration for n in group), default=0.0)
+    if max_dur > 0 and note.duration < max_dur * ornament_ratio and not (
+        note is top or note is bass
+    ):
+        score -= 2.0
+    elif note.duration >= 2.0:
+        score += 4.0
+    elif note.duration >= 1.0:
+        score += 2.0
+    score += metric_strength(note.onset, beats_per_bar=beats_per_bar)
+    if prev_main is not None:
+        interval = abs(note.pitch - prev_main.pitch)
+        if interval == 0:
+            score += 4.0
+        elif interval <= 2:
+            score += 3.0
+        elif interval <= 5:
+            score += 1.0
+        elif interval > 12:
+            score -= 2.0
+    return score
+
+
+def reference_select(events, beats_per_bar=4):
+    if not events:
+        return []
+    groups = group_by_onset(events)
+    primary_voice = detect_primary_voice(groups)
+    result = []
+    prev_main = None
+    for onset in sorted(groups):
+        group = groups[onset]
+        best, best_score = group[0], float("-inf")
+        for note in group:
+            s = reference_score(note, group, primary_voice, prev_main, beats_per_bar)
+            if s > best_score:
+                best, best_score = note, s
+        result.append(best)
+        prev_main = best
+    return result
+
+
+def random_note(rng):
+    return NoteEvent(
+        onset=rng.randint(0, 16) / 2,
+        duration=rng.choice([0.1, 0.25, 0.5, 1.0, 2.0, 3.0]),
+        pitch=rng.randint(21, 108),
+        staff=rng.choice(["RH", "LH", None]),
+        voice=rng.choice([1, 2, None]),
+        is_grace=rng.random() < 0.1,
+    )
+
+
+def random_piece(rng, max_notes=40):
+    return [random_note(rng) for _ in range(rng.randint(0, max_notes))]
+
+
+def assert_same_notes(got, expected):
+    assert len(got) == len(expected)
+    assert all(a is b for a, b in zip(got, expected))
+
+
+@pytest.mark.parametrize("beats_per_bar", [2, 3, 4])
+def test_default_rules_match_reference_on_pathetique(beats_per_bar):
+    events, _ = midi_to_note_events(PATHETIQUE)
+    assert_same_notes(
+        select_main_rhythm(events, beats_per_bar=beats_per_bar),
+        reference_select(events, beats_per_bar=beats_per_bar),
+    )
+
+
+def test_default_rules_match_reference_on_random_pieces():
+    rng = random.Random(0)
+    for _ in range(300):
+        events = random_piece(rng)
+        beats_per_bar = rng.choice([2, 3, 4])
+        assert_same_notes(
+            select_main_rhythm(events, beats_per_bar=beats_per_bar),
+            reference_select(events, beats_per_bar=beats_per_bar),
+        )
+
+
+def test_score_note_matches_reference():
+    rng = random.Random(1)
+    for _ in range(2000):
+        group = [random_note(rng) for _ in range(rng.randint(1, 6))]
+        # Include notes outside the group, possibly at another onset.
+        note = rng.choice(group + [random_note(rng)])
+        prev_main = rng.choice([None, random_note(rng)])
+        primary_voice = rng.choice(["top", "bass"])
+        beats_per_bar = rng.choice([2, 3, 4])
+        ornament_ratio = rng.choice([0.1, 0.25, 0.5])
+        assert score_note(
+            note, group, primary_voice, prev_main, beats_per_bar, ornament_ratio=ornament_ratio
+        ) == reference_score(note, group, primary_voice, prev_main, beats_per_bar, ornament_ratio)
+
+
+def test_out_of_range_interval_scores_as_leap():
+    far = NoteEvent(onset=0.0, duration=1.0, pitch=300, staff=None, voice=None)
+    near = NoteEvent(onset=1.0, duration=1.0, pitch=60, staff=None, voice=None)
+    assert score_note(near, [near], "top", far) == reference_score(near, [near], "top", far)
+
+
+def test_custom_rules_change_selection():
+    low = NoteEvent(onset=1.0, duration=1.0, pitch=48, staff="LH", voice=None)
+    high = NoteEvent(onset=1.0, duration=1.0, pitch=72, staff="RH", voice=None)
+    assert select_main_rhythm([low, high]) == [high]
+    assert select_main_rhythm([low, high], rules=RuleSet(staff={"LH": 20.0})) == [low]
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from music_segmentation_toolkit_rule_based_beethoven import RuleSet, compile_rules, load_rules
+from music_segmentation_toolkit_rule_based_beethoven.rules import DEFAULT_RULES, MAX_INTERVAL
+
+
+def test_compile_default_tables():
+    rules = compile_rules(RuleSet())
+    assert rules.metric == (0.0, 1.0, 2.0)
+    assert rules.interval[0] == 4.0
+    assert rules.interval[2] == 3.0
+    assert rules.interval[12] == 0.0
+    assert rules.interval[13] == -2.0
+    assert len(rules.interval) == MAX_INTERVAL + 1
+
+
+def test_compile_rejects_bad_metric():
+    with pytest.raises(ValueError):
+        compile_rules(RuleSet(metric=(0.0, 1.0)))
+
+
+def test_compiled_tables_are_read_only():
+    with pytest.raises(TypeError):
+        DEFAULT_RULES.staff["LH"] = 5.0
+    with pytest.raises(TypeError):
+        DEFAULT_RULES.rank["top"] = (0.0,) * 4
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"bogus": 1.0},
+        {"staff": None},
+        {"voice": None},
+        {"voice": {"x": 1.0}},
+        {"interval": [[2.5, 1.0]]},
+        {"top": None},
+    ],
+)
+def test_from_dict_rejects_malformed_values(data):
+    with pytest.raises(ValueError):
+        RuleSet.from_dict(data)
+
+
+def test_load_rules_json(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"top": 5, "voice": {"2": 1.5}, "interval": [[0, 4], [3, 2]]}))
+    rules = load_rules(path)
+    assert rules.top == 5.0
+    assert rules.voice == {2: 1.5}
+    assert rules.interval == [(0, 4.0), (3, 2.0)]
+    assert rules.bass == RuleSet().bass
+
+
+def test_load_rules_toml(tmp_path):
+    try:
+        import tomllib  # noqa: F401
+    except ImportError:
+        pytest.importorskip("tomli")
+    path = tmp_path / "rules.toml"
+    path.write_text("top = 5.0\n[staff]\nRH = 1.5\n")
+    rules = load_rules(path)
+    assert rules.top == 5.0
+    assert rules.staff == {"RH": 1.5}